@@ -0,0 +1,125 @@
+# benchmarks/bench_body_memory.py
+"""
+Memory per body and allocation churn: dict-backed vs slotted CelestialBody.
+
+Run from the repo root:
+    python -m benchmarks.bench_body_memory
+    python -m benchmarks.bench_body_memory --bodies 50000 --shots 20000
+"""
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import itertools
+import tracemalloc
+
+from config import DEFAULT_DIAMETER_M, DEFAULT_DENSITY
+from entities import CelestialBody, BodyPool
+
+
+_dict_ids = itertools.count()
+
+
+class DictBody:
+    """Dict-backed equivalent of CelestialBody (same fields, plain class, no __slots__)."""
+
+    def __init__(self, x, y, vx, vy, mass, radius, color, nasa_data=None,
+                 diameter_m=DEFAULT_DIAMETER_M, density=DEFAULT_DENSITY):
+        self.body_id = next(_dict_ids)
+        self.x = x
+        self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.vx = vx
+        self.vy = vy
+        self.mass = mass
+        self.radius = radius
+        self.color = color
+        self.orbit = []
+        self.nasa_data = nasa_data
+        self.diameter_m = diameter_m
+        self.density = density
+
+
+def bytes_per_body(n: int, factory) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    bodies = [factory(i) for i in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    del bodies
+    return total / n
+
+
+class Fire:
+    """Fires demo asteroids either by allocating (no pool) or through a BodyPool."""
+
+    def __init__(self, pool=None):
+        self.pool = pool
+        self.record = {"name": "demo"}
+        self.allocated = 0
+
+    def __call__(self, i):
+        args = (float(i), 1.0, 0.5, 0.5, 2, 5, (200, 200, 200), self.record)
+        if self.pool is None:
+            self.allocated += 1
+            body = DictBody(*args)
+            body.diameter_m = 150.0
+            body.density = 3000.0
+            return body
+        if not len(self.pool):
+            self.allocated += 1
+        return self.pool.acquire(*args, diameter_m=150.0, density=3000.0)
+
+    def release(self, body):
+        if self.pool is not None:
+            self.pool.release(body)
+
+
+def churn(shots: int, live: int, fire: Fire) -> tuple[int, int]:
+    """Fire `shots` asteroids keeping at most `live` alive; return (peak bytes, bodies allocated)."""
+    tracemalloc.start()
+    active = []
+    for i in range(shots):
+        active.append(fire(i))
+        # each asteroid gets a short trail before it is culled
+        active[-1].orbit.extend((float(i), float(k)) for k in range(16))
+        if len(active) > live:
+            fire.release(active.pop(0))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, fire.allocated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bodies", type=int, default=10_000)
+    parser.add_argument("--shots", type=int, default=10_000)
+    parser.add_argument("--live", type=int, default=50, help="asteroids alive at once")
+    args = parser.parse_args()
+
+    record = {"name": "demo"}
+
+    def dict_body(i):
+        b = DictBody(float(i), 1.0, 0.5, 0.5, 2, 5, (200, 200, 200), record)
+        b.diameter_m = 150.0
+        b.density = 3000.0
+        return b
+
+    def slot_body(i):
+        return CelestialBody(float(i), 1.0, 0.5, 0.5, 2, 5, (200, 200, 200), record,
+                             diameter_m=150.0, density=3000.0)
+
+    print(f"bytes/body  dict-backed: {bytes_per_body(args.bodies, dict_body):7.1f}")
+    print(f"bytes/body  slotted:     {bytes_per_body(args.bodies, slot_body):7.1f}")
+
+    peak, created = churn(args.shots, args.live, Fire())
+    print(f"rapid fire  dict-backed: {created:6d} bodies allocated, peak {peak / 1024:8.1f} KiB")
+    peak, created = churn(args.shots, args.live, Fire(BodyPool()))
+    print(f"rapid fire  pooled:      {created:6d} bodies allocated, peak {peak / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_catalog.py
+"""
+NeoCatalog index build, query and weighted-sampling timings on a synthetic catalog.
+
+Run from the repo root:
+    python -m benchmarks.bench_catalog
+    python -m benchmarks.bench_catalog --size 1000000 --repeat 50
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from data.catalog import NeoCatalog, day_number
+
+
+def synthetic_catalog(n: int, seed: int = 0) -> NeoCatalog:
+    """Roughly NeoWs-shaped columns (no per-object records)."""
+    rng = np.random.default_rng(seed)
+    start = day_number("2025-10-05")
+    columns = {
+        "diameter_m": rng.lognormal(mean=4.0, sigma=1.2, size=n),
+        "speed_kmh": rng.gamma(shape=4.0, scale=15_000.0, size=n),
+        "miss_km": rng.uniform(1e4, 7.5e7, size=n),
+        "approach_day": start + rng.integers(0, 180, size=n),
+        "magnitude_h": rng.uniform(15.0, 32.0, size=n),
+    }
+    hazardous = rng.random(n) < 0.05
+    return NeoCatalog(columns, hazardous)
+
+
+def best_ms(fn, repeat: int) -> float:
+    """Median wall time of fn() in ms."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return float(np.median(times))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    cat = synthetic_catalog(args.size)
+    print(f"build {args.size} rows + indexes: {(time.perf_counter() - t0) * 1000.0:.1f} ms")
+
+    q = cat.query()
+    week = ("2025-10-05", "2025-10-12")
+    rng = random.Random(0)
+    cases = {
+        "hazardous only": lambda: q.hazardous().count(),
+        "diameter 100..500 m": lambda: q.diameter_between(100, 500).count(),
+        "hazardous & diameter 100..500 m": lambda: q.hazardous().diameter_between(100, 500).count(),
+        "diameter 1..2 km (selective)": lambda: q.diameter_between(1000, 2000).count(),
+        "fastest 20": lambda: q.fastest(20),
+        "fastest 20 hazardous": lambda: q.hazardous().fastest(20),
+        "closest 20 this week": lambda: q.approaching_between(*week).closest(20),
+        "sample (uniform)": lambda: q.sample(rng=rng),
+        "sample (hazard-weighted)": lambda: q.sample("hazard", rng),
+        "sample (size-weighted, hazardous)": lambda: q.hazardous().sample("size", rng),
+        "linear scan baseline (diameter)": lambda: int(np.count_nonzero(
+            (cat.columns["diameter_m"] >= 100) & (cat.columns["diameter_m"] <= 500))),
+        "linear scan baseline (1..2 km)": lambda: int(np.count_nonzero(
+            (cat.columns["diameter_m"] >= 1000) & (cat.columns["diameter_m"] <= 2000))),
+    }
+    width = max(len(name) for name in cases)
+    for name, fn in cases.items():
+        print(f"{name:<{width}}  {best_ms(fn, args.repeat):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_render.py
+"""
+Compare per-body drawing (CelestialBody.draw) with the batched BodyRenderer.
+
+Run from the repo root (uses the SDL dummy video driver, no window):
+    python -m benchmarks.bench_render
+    python -m benchmarks.bench_render --counts 1000 10000 --frames 50 --trail 0
+
+Every body gets a trail of --trail points (default 240, about 4 s of flight),
+as asteroids do in game. The legacy path draws the whole trail; BodyRenderer
+draws at most TRAIL_MAX_POINTS of it, still one draw.lines call per body.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import random
+import time
+
+import pygame
+
+from entities import CelestialBody
+from ui.renderer import BodyRenderer
+
+WIDTH, HEIGHT = 800, 600
+COLORS = [(200, 200, 200), (180, 180, 255), (255, 200, 0)]
+
+
+def make_bodies(n: int, trail: int, seed: int = 0):
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(n):
+        x, y = rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)
+        b = CelestialBody(x, y, 0.0, 0.0, mass=2, radius=5, color=rng.choice(COLORS))
+        b.orbit = [(x - i, y - i) for i in range(trail, 0, -1)]
+        bodies.append(b)
+    return bodies
+
+
+def time_frames(screen, frames: int, draw) -> float:
+    """Average ms per frame for draw()."""
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((0, 0, 0))
+        draw()
+    return (time.perf_counter() - t0) * 1000.0 / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--trail", type=int, default=240, help="trail points per body")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    print(f"{'bodies':>8} {'per-body ms':>12} {'blits ms':>10} {'splat ms':>10}")
+    for n in args.counts:
+        bodies = make_bodies(n, args.trail)
+        sprites = BodyRenderer(splat_threshold=n + 1)
+        splats = BodyRenderer(splat_threshold=0)
+
+        def legacy():
+            for b in bodies:
+                b.draw(screen)
+
+        legacy_ms = time_frames(screen, args.frames, legacy)
+        blits_ms = time_frames(screen, args.frames, lambda: sprites.draw(screen, bodies))
+        splat_ms = time_frames(screen, args.frames, lambda: splats.draw(screen, bodies))
+        print(f"{n:>8} {legacy_ms:>12.2f} {blits_ms:>10.2f} {splat_ms:>10.2f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# data/catalog.py
+import random
+from datetime import date
+
+import numpy as np
+
+from data.nasa_data import relative_speed_kmh
+
+HAZARD_WEIGHT = 5.0          # hazardous objects are this many times likelier under weight="hazard"
+SCATTER_FRACTION = 8         # range_mask scatters index slices under size/8 rows, else compares the column
+
+# Numeric fields with a sorted index (field -> dtype)
+FIELDS = {
+    "diameter_m": np.float64,     # estimated_diameter.meters.estimated_diameter_max
+    "speed_kmh": np.float64,      # first close approach relative velocity
+    "miss_km": np.float64,        # first close approach miss distance
+    "approach_day": np.int64,     # first close approach date, days since 1970-01-01
+    "magnitude_h": np.float64,    # absolute magnitude
+}
+
+
+def day_number(value) -> int:
+    """Date / 'YYYY-MM-DD' -> days since epoch (sortable int)."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(np.datetime64(str(value), "D").astype(np.int64))
+
+
+def _first_float(ast: dict, path) -> float:
+    try:
+        value = ast
+        for key in path:
+            value = value[key]
+        return float(value)
+    except (KeyError, IndexError, TypeError, ValueError):
+        return np.nan
+
+
+class NeoCatalog:
+    """
+    Column store over NeoWs records with indexes for fast filtering.
+
+    - Sorted index per numeric field (argsort order + sorted values): range
+      bounds are two searchsorted calls; range_rows() returns the matching
+      slice of the index. range_mask() scatters that slice into a bitmap
+      when it is small, and does a vectorized column compare otherwise,
+      since the compare is cheaper for wide ranges.
+    - Bitmap index for `hazardous` (precomputed boolean masks).
+
+    Queries are composed with catalog.query() and combine bitmaps with &,
+    e.g.  catalog.query().hazardous().where("diameter_m", 100, 500).top("speed_kmh", 20)
+    """
+
+    def __init__(self, columns: dict, hazardous, records: list | None = None):
+        self.columns = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in FIELDS.items()}
+        self.hazardous = np.asarray(hazardous, dtype=bool)
+        self.records = records
+        self.size = len(self.hazardous)
+
+        self._order = {}
+        self._sorted = {}
+        self._valid = {}      # rows before the NaN tail of each sorted index
+        for name, col in self.columns.items():
+            order = np.argsort(col, kind="stable")     # NaNs sort last
+            self._order[name] = order
+            self._sorted[name] = col[order]
+            self._valid[name] = self.size - int(np.isnan(col).sum()) if col.dtype.kind == "f" else self.size
+        self._bitmaps = {True: self.hazardous, False: ~self.hazardous}
+        self._weights = {}
+        self._cumweights = {}
+
+    @classmethod
+    def from_records(cls, records: list) -> "NeoCatalog":
+        """Build from the NeoWs dicts returned by data.nasa_data.get_asteroid()."""
+        n = len(records)
+        cols = {name: np.empty(n, dtype=dtype) for name, dtype in FIELDS.items()}
+        hazardous = np.zeros(n, dtype=bool)
+        for i, ast in enumerate(records):
+            ca = (ast.get('close_approach_data') or [{}])[0]
+            cols["diameter_m"][i] = _first_float(ast, ('estimated_diameter', 'meters', 'estimated_diameter_max'))
+            cols["speed_kmh"][i] = relative_speed_kmh(ast, default=np.nan)
+            cols["miss_km"][i] = _first_float(ca, ('miss_distance', 'kilometers'))
+            cols["approach_day"][i] = day_number(ca['close_approach_date']) if 'close_approach_date' in ca else -1
+            cols["magnitude_h"][i] = _first_float(ast, ('absolute_magnitude_h',))
+            hazardous[i] = bool(ast.get('is_potentially_hazardous_asteroid', False))
+        return cls(cols, hazardous, records)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def record(self, i: int) -> dict:
+        return self.records[i]
+
+    def query(self) -> "NeoQuery":
+        return NeoQuery(self, None)
+
+    # -------------------------------------------------------------------------
+    # Index primitives
+    # -------------------------------------------------------------------------
+    def _bounds(self, field: str, lo, hi) -> tuple:
+        """[start, stop) of lo <= field <= hi in the sorted index (NaN tail excluded)."""
+        values = self._sorted[field]
+        start = 0 if lo is None else int(np.searchsorted(values, lo, side="left"))
+        if hi is None:
+            stop = self._valid[field]
+        else:
+            stop = min(self._valid[field], int(np.searchsorted(values, hi, side="right")))
+        return start, max(start, stop)
+
+    def range_rows(self, field: str, lo=None, hi=None) -> np.ndarray:
+        """Row indices with lo <= field <= hi, in ascending `field` order (a view, no copy)."""
+        start, stop = self._bounds(field, lo, hi)
+        return self._order[field][start:stop]
+
+    def range_mask(self, field: str, lo=None, hi=None) -> np.ndarray:
+        """Bitmap of rows with lo <= field <= hi (either bound optional; NaN never matches)."""
+        start, stop = self._bounds(field, lo, hi)
+        if (stop - start) * SCATTER_FRACTION < self.size:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self._order[field][start:stop]] = True
+            return mask
+        col = self.columns[field]
+        if lo is None and hi is None:
+            return ~np.isnan(col) if col.dtype.kind == "f" else np.ones(self.size, dtype=bool)
+        if lo is None:
+            return col <= hi
+        if hi is None:
+            return col >= lo
+        return (col >= lo) & (col <= hi)
+
+
+class NeoQuery:
+    """Immutable, composable filter over a NeoCatalog (a bitmap; None = all rows)."""
+
+    def __init__(self, catalog: NeoCatalog, mask):
+        self.catalog = catalog
+        self.mask = mask
+
+    def _and(self, other: np.ndarray) -> "NeoQuery":
+        return NeoQuery(self.catalog, other if self.mask is None else self.mask & other)
+
+    # -------------------------------------------------------------------------
+    # Filters
+    # -------------------------------------------------------------------------
+    def where(self, field: str, lo=None, hi=None) -> "NeoQuery":
+        return self._and(self.catalog.range_mask(field, lo, hi))
+
+    def hazardous(self, flag: bool = True) -> "NeoQuery":
+        return self._and(self.catalog._bitmaps[bool(flag)])
+
+    def diameter_between(self, lo_m=None, hi_m=None) -> "NeoQuery":
+        return self.where("diameter_m", lo_m, hi_m)
+
+    def speed_between(self, lo_kmh=None, hi_kmh=None) -> "NeoQuery":
+        return self.where("speed_kmh", lo_kmh, hi_kmh)
+
+    def approaching_between(self, start, end) -> "NeoQuery":
+        """Close approach date in [start, end] (date objects or 'YYYY-MM-DD')."""
+        return self.where("approach_day", day_number(start), day_number(end))
+
+    def approaching_within(self, days: int, start=None) -> "NeoQuery":
+        start = day_number(start if start is not None else date.today())
+        return self.where("approach_day", start, start + days)
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+    def indices(self) -> np.ndarray:
+        if self.mask is None:
+            return np.arange(self.catalog.size)
+        return np.flatnonzero(self.mask)
+
+    def count(self) -> int:
+        return self.catalog.size if self.mask is None else int(np.count_nonzero(self.mask))
+
+    def records(self) -> list:
+        return [self.catalog.records[i] for i in self.indices()]
+
+    def top(self, field: str, n: int, largest: bool = True) -> np.ndarray:
+        """Indices of the n rows with the largest (or smallest) `field`, walking its sorted index."""
+        order = self.catalog._order[field][:self.catalog._valid[field]]
+        if self.mask is not None:
+            order = order[self.mask[order]]
+        return order[::-1][:n] if largest else order[:n]
+
+    def fastest(self, n: int) -> np.ndarray:
+        return self.top("speed_kmh", n)
+
+    def closest(self, n: int) -> np.ndarray:
+        return self.top("miss_km", n, largest=False)
+
+    def sample(self, weight=None, rng=random):
+        """
+        Index of one row drawn from the filtered set, or None if it is empty.
+        weight: None (uniform) | "hazard" | "size" | "speed" | array over the catalog.
+        rng: anything with .random() (the random module, random.Random, ...).
+        """
+        cat = self.catalog
+        w = self._weights(weight)
+        if self.mask is None:
+            if not cat.size:
+                return None
+            if w is None:
+                return int(rng.random() * cat.size)
+            # whole catalog: reuse the cached cumulative weights
+            key = weight if isinstance(weight, str) else None
+            cum = cat._cumweights.get(key) if key else None
+            if cum is None:
+                cum = np.cumsum(w)
+                if key:
+                    cat._cumweights[key] = cum
+            idx = None
+        else:
+            idx = np.flatnonzero(self.mask)
+            if not len(idx):
+                return None
+            if w is None:
+                return int(idx[int(rng.random() * len(idx))])
+            cum = np.cumsum(w[idx])
+
+        n = len(cum)
+        if not cum[-1] > 0:
+            k = int(rng.random() * n)
+        else:
+            k = min(int(np.searchsorted(cum, rng.random() * cum[-1], side="right")), n - 1)
+        return k if idx is None else int(idx[k])
+
+    def _weights(self, weight):
+        cat = self.catalog
+        if weight is None:
+            return None
+        if not isinstance(weight, str):
+            return np.asarray(weight, dtype=np.float64)
+        w = cat._weights.get(weight)
+        if w is None:
+            if weight == "hazard":
+                w = np.where(cat.hazardous, HAZARD_WEIGHT, 1.0)
+            elif weight == "size":
+                w = np.nan_to_num(cat.columns["diameter_m"])
+            elif weight == "speed":
+                w = np.nan_to_num(cat.columns["speed_kmh"])
+            else:
+                raise ValueError(f"unknown weight {weight!r}")
+            cat._weights[weight] = w
+        return w
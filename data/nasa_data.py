@@ -22,6 +22,16 @@ def fetch_neo_feed(api_key, start_date, end_date):
     data = requests.get(url, params=params).json()
     return data
 
+def relative_speed_kmh(ast, default=None):
+    """First close-approach relative velocity (km/h) of a NeoWs record, or `default`."""
+    ca_list = ast.get('close_approach_data', [])
+    if not ca_list:
+        return default
+    try:
+        return float(ca_list[0]['relative_velocity']['kilometers_per_hour'])
+    except (KeyError, TypeError, ValueError):
+        return default
+
 # Example usage:
 def get_asteroid(start_date=None, end_date=None, live=True):
     if start_date is None:
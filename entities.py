@@ -1,20 +1,48 @@
-import pygame
+import itertools
+
+from config import DEFAULT_DIAMETER_M, DEFAULT_DENSITY
+
+_body_ids = itertools.count()
 
 class CelestialBody:
-    def __init__(self, x, y, vx, vy, mass, radius, color, nasa_data = None):
+    # Fixed attribute set: no per-instance __dict__, so bodies stay small
+    __slots__ = (
+        "body_id", "x", "y", "prev_x", "prev_y", "vx", "vy", "mass", "radius", "color",
+        "orbit", "nasa_data", "diameter_m", "density",
+    )
+
+    def __init__(self, x, y, vx, vy, mass, radius, color, nasa_data = None,
+                 diameter_m = DEFAULT_DIAMETER_M, density = DEFAULT_DENSITY):
+        # Store past positions for drawing an orbit trail
+        self.orbit = []
+        self.reset(x, y, vx, vy, mass, radius, color, nasa_data, diameter_m, density)
+
+    def reset(self, x, y, vx, vy, mass, radius, color, nasa_data = None,
+              diameter_m = DEFAULT_DIAMETER_M, density = DEFAULT_DENSITY):
+        # Unique per launch (a recycled body gets a fresh id)
+        self.body_id = next(_body_ids)
         # Position, velocity, mass, visual radius, and color
         self.x = x
         self.y = y
+        # Position before the last physics tick (for render interpolation)
+        self.prev_x = x
+        self.prev_y = y
         self.vx = vx
         self.vy = vy
         self.mass = mass
         self.radius = radius
         self.color = color
-        # Store past positions for drawing an orbit trail
-        self.orbit = []
-        self.nasa_data = nasa_data  # Store original NASA data if provided
+        self.orbit.clear()
+        self.nasa_data = nasa_data  # Shared reference to the NASA record (not copied)
+        # Physical parameters for impact + deflection math
+        self.diameter_m = diameter_m
+        self.density = density
+        return self
 
     def draw(self, screen):
+        # pygame is imported here so headless users (service/jobs.py) never load it
+        import pygame
+
         # Draw the orbit trail as a line (if enough points)
         if len(self.orbit) > 1:
             # Convert orbit points to integers for pygame.draw
@@ -22,4 +50,32 @@ class CelestialBody:
             pygame.draw.lines(screen, self.color, False, points, 1)
         # Draw the body as a filled circle
         pygame.draw.circle(screen, self.color,
-                           (int(self.x), int(self.y)), self.radius)
\ No newline at end of file
+                           (int(self.x), int(self.y)), self.radius)
+
+
+class BodyPool:
+    """
+    Free list of CelestialBody instances.
+    Culled asteroids are released back here and re-initialised in place by
+    acquire(), so rapid fire does not allocate a new body (and trail list) per shot.
+    """
+
+    def __init__(self, max_free=1024):
+        self.max_free = max_free
+        self._free = []
+
+    def acquire(self, x, y, vx, vy, mass, radius, color, nasa_data = None,
+                diameter_m = DEFAULT_DIAMETER_M, density = DEFAULT_DENSITY):
+        if self._free:
+            body = self._free.pop()
+            return body.reset(x, y, vx, vy, mass, radius, color, nasa_data, diameter_m, density)
+        return CelestialBody(x, y, vx, vy, mass, radius, color, nasa_data, diameter_m, density)
+
+    def release(self, body):
+        if len(self._free) < self.max_free:
+            body.nasa_data = None   # drop the record reference while parked
+            body.orbit.clear()
+            self._free.append(body)
+
+    def __len__(self):
+        return len(self._free)
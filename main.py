@@ -6,14 +6,16 @@ except Exception:
     # Fallback for pygbag runtime
     import pygbag.aio as asyncio
 
+import os
 import math
 import json
 import random
 import pygame
 
 import physics
-from entities import CelestialBody
-from data.nasa_data import get_asteroid as load_nasa_data
+from scheduler import FrameScheduler, SIM_HZ
+from entities import CelestialBody, BodyPool
+from data.nasa_data import get_asteroid as load_nasa_data, relative_speed_kmh
 from screens import earth_collision  # (currently unused but kept for future)
 from config import (
     M_PER_PX,
@@ -27,6 +29,7 @@ from config import (
 from models.impact_effects import effects, mass_from_diam
 from models.deflection import delta_v_kinetic, add_delta_v
 from ui.overlays import draw_effects, info_lines
+from ui.renderer import BodyRenderer
 
 # (optional)
 try:
@@ -34,16 +37,48 @@ try:
 except Exception:
     sample_neo = None
 
+# (optional; need numpy)
+try:
+    from data.catalog import NeoCatalog
+except Exception:
+    NeoCatalog = None
+
+try:
+    from ui.heatmap import DamageLayer
+except Exception:
+    DamageLayer = None
+
+try:
+    from recording import TrajectoryRecorder
+except Exception:
+    TrajectoryRecorder = None
+
 from orbits import spawn_circular_orbit
+from world import (
+    WIDTH,
+    HEIGHT,
+    LAUNCHER_INIT_X,
+    LAUNCHER_INIT_Y,
+    EARTH_POS,
+    EARTH_MASS,
+    EARTH_RADIUS,
+    EARTH_COLOR,
+    MOON_DISTANCE_PX,
+    MOON_MASS,
+    MOON_RADIUS_PX,
+    MOON_COLOR,
+    PHYS_G,
+    KMH_TO_PPF,
+)
 
 
 # =============================================================================
 # Constants / Config
 # =============================================================================
 
-# Window
-WIDTH, HEIGHT = 800, 600
+# Window (size comes from world.py)
 FPS = 60
+FRAME_BUDGET_MS = 1000.0 / FPS   # work budget per frame before degrading
 
 # Controls
 KEY_TURN_LEFT = pygame.K_a
@@ -54,36 +89,30 @@ KEY_MOVE_UP = pygame.K_UP
 KEY_MOVE_DOWN = pygame.K_DOWN
 KEY_LAUNCH = pygame.K_SPACE
 KEY_DEFLECT = pygame.K_f          # moved from K_d to avoid conflict with aiming
-KEY_LOAD_RANDOM_NEO = pygame.K_n  # only active if sample_neo is available
+KEY_LOAD_RANDOM_NEO = pygame.K_n  # falls back to sample_neo if the catalog is empty
+KEY_EXPORT_DAMAGE = pygame.K_e    # only active if the damage layer is available
 
-# Launcher
-LAUNCHER_INIT_X, LAUNCHER_INIT_Y = 400, 580
+# Launcher (start position comes from world.py)
 LAUNCHER_SPEED = 6               # px per frame
 BARREL_LENGTH = 40
 
-# World / Primary bodies
-EARTH_POS = (400, 300)
-EARTH_MASS = 10000
-EARTH_RADIUS = 20
-EARTH_COLOR = (0, 100, 255)
-
-MOON_DISTANCE_PX = 120
-MOON_MASS = 100
-MOON_RADIUS_PX = 8
-MOON_COLOR = (180, 180, 255)
-PHYS_G = 0.1                     # must match physics.G in your engine
-
-# Asteroid gameplay scaling
-KMH_TO_PPF = 0.00003             # real km/h -> pixels per frame (tunable)
+# Catalog sampling weights (see data.catalog.NeoQuery.sample); uniform without numpy
+NEXT_ASTEROID_WEIGHT = "hazard"  # queue of launches favours hazardous NEOs
+LOAD_NEO_WEIGHT = "size"         # N key favours large NEOs
 
 # HUD
 HUD_MARGIN = 10
 HUD_LINE_HEIGHT = 18
 HUD_COLOR = (255, 255, 255)
 HUD_ALT_COLOR = (200, 220, 255)
+HUD_TEXT_CACHE_SIZE = 64         # rendered HUD lines kept (cache is cleared when full)
+
+# Trajectory recording (desktop only; set to a directory to enable)
+RECORD_DIR_ENV = "ASTEROID_RECORD_DIR"
 
 # Effects overlay
 EFFECTS_DURATION_MS = 2500
+DAMAGE_EXPORT_PATH = "damage_grid.npz"
 
 
 # =============================================================================
@@ -96,28 +125,23 @@ def render_text(surface: pygame.Surface, text: str, pos: tuple[int, int], font:
     surface.blit(font.render(text, antialias, color), pos)
 
 
-def make_asteroid(launch_pos, angle_rad, nasa_asteroid_data) -> CelestialBody:
+def make_asteroid(launch_pos, angle_rad, nasa_asteroid_data,
+                  diameter_m: float = DEFAULT_DIAMETER_M, density: float = DEFAULT_DENSITY,
+                  pool: BodyPool | None = None) -> CelestialBody:
     """
     Create an asteroid CelestialBody from NASA data.
-    Converts NASA km/h to your game's px/frame via KMH_TO_PPF.
+    Converts NASA km/h to your game's px/tick via KMH_TO_PPF.
+    If a pool is given, a recycled body is reused instead of allocating a new one.
     """
-    ca_list = nasa_asteroid_data.get('close_approach_data', [])
-    if not ca_list:
-        speed_kmh = 20000.0  # fallback km/h
-    else:
-        rel_vel = ca_list[0].get('relative_velocity', {})
-        try:
-            speed_kmh = float(rel_vel.get('kilometers_per_hour', 20000.0))
-        except (TypeError, ValueError):
-            speed_kmh = 20000.0
-
+    speed_kmh = relative_speed_kmh(nasa_asteroid_data, default=20000.0)  # fallback km/h
     speed_ppf = speed_kmh * KMH_TO_PPF
-    print(f"{nasa_asteroid_data['name']} is moving at {speed_ppf:.4f} px/frame")
+    print(f"{nasa_asteroid_data['name']} is moving at {speed_ppf:.4f} px/tick")
 
     vx = speed_ppf * math.cos(angle_rad)
     vy = -speed_ppf * math.sin(angle_rad)
 
-    return CelestialBody(
+    new_body = pool.acquire if pool is not None else CelestialBody
+    return new_body(
         x=launch_pos[0],
         y=launch_pos[1],
         vx=vx,
@@ -125,10 +149,32 @@ def make_asteroid(launch_pos, angle_rad, nasa_asteroid_data) -> CelestialBody:
         mass=2,
         radius=5,
         color=(200, 200, 200),
-        nasa_data=nasa_asteroid_data
+        nasa_data=nasa_asteroid_data,
+        diameter_m=diameter_m,
+        density=density,
     )
 
 
+def neo_diameter_m(ast: dict) -> float | None:
+    """Estimated max diameter (m) of a NeoWs record, or None if missing."""
+    try:
+        return float(ast['estimated_diameter']['meters']['estimated_diameter_max'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def preset_asteroid(neo: dict) -> dict:
+    """NeoWs-shaped record for a data.neows.sample_neo() preset, so it can be launched."""
+    return {
+        "name": neo["name"],
+        "estimated_diameter": {"meters": {"estimated_diameter_max": neo["diameter_m"]}},
+        "is_potentially_hazardous_asteroid": False,
+        "close_approach_data": [
+            {"relative_velocity": {"kilometers_per_hour": str(neo["speed_mps"] * 3.6)}}
+        ],
+    }
+
+
 # =============================================================================
 # Game
 # =============================================================================
@@ -142,9 +188,10 @@ class Game:
       - Launch asteroid: Space
       - Deflect last-fired asteroid: F
       - Load random NEO sample (if available): N
+      - Export cumulative damage grid: E
     """
 
-    def __init__(self) -> None:
+    def __init__(self, record_dir: str | None = None) -> None:
         pygame.init()
         # Audio not supported in pygbag; ensure mixer is off (harmless on desktop)
         try:
@@ -160,10 +207,22 @@ class Game:
         self.font_sm = pygame.font.SysFont(None, 20)
         self.font = pygame.font.SysFont(None, 24)
 
+        # Batched body renderer (sprite atlas / point splats)
+        self.renderer = BodyRenderer()
+
+        # Fixed-rate simulation + frame budget / degradation
+        self.scheduler = FrameScheduler(sim_hz=SIM_HZ, budget_ms=FRAME_BUDGET_MS)
+
+        # HUD lines as (text surface, pos); re-blitted as-is on frames that skip the HUD
+        self._hud_items: list[tuple[pygame.Surface, tuple[int, int]]] = []
+        self._hud_text_cache: dict = {}   # (text, color) -> rendered surface
+
         # Data
         # Set live=True to fetch from NASA API (requires network; avoid for offline/web bundle)
         self.nasa_asteroids = load_nasa_data(live=False)
-        self.next_asteroid = random.choice(self.nasa_asteroids)
+        self.catalog = NeoCatalog.from_records(self.nasa_asteroids) if NeoCatalog else None
+        self.next_launch_params = None   # diameter_m/density for the next launch only (N key)
+        self.next_asteroid = self.pick_next_asteroid()
 
         # Primary bodies
         self.earth = CelestialBody(
@@ -181,8 +240,9 @@ class Game:
         )
         self.primaries: list[CelestialBody] = [self.earth, self.moon]
 
-        # Dynamic bodies
+        # Dynamic bodies (culled asteroids are recycled through the pool)
         self.asteroids: list[CelestialBody] = []
+        self.asteroid_pool = BodyPool()
 
         # Launcher state
         self.launcher_x = LAUNCHER_INIT_X
@@ -201,6 +261,16 @@ class Game:
         self.last_effects = None
         self.effects_expire_ms = 0
 
+        # Cumulative blast exposure around Earth (persists across impacts)
+        self.damage = DamageLayer() if DamageLayer else None
+
+        # Simulation tick counter + optional per-tick state recorder
+        self.tick = 0
+        self.recorder = TrajectoryRecorder(record_dir) if record_dir and TrajectoryRecorder else None
+        if self.recorder:
+            self.recorder.register_body(self.earth.body_id, "Earth", "earth")
+            self.recorder.register_body(self.moon.body_id, "Moon", "moon")
+
         # Running flag
         self.running = True
 
@@ -251,14 +321,26 @@ class Game:
         if key == KEY_DEFLECT:
             self.deflect_last_asteroid()
 
-        # Load random NEO sample
-        if key == KEY_LOAD_RANDOM_NEO and sample_neo:
+        # Export accumulated damage grid
+        if key == KEY_EXPORT_DAMAGE and self.damage:
+            path = self.damage.export(DAMAGE_EXPORT_PATH)
+            print(f"Damage grid ({self.damage.impacts} impacts) saved to {path}")
+
+        # Load random NEO (size-weighted from the catalog)
+        if key == KEY_LOAD_RANDOM_NEO:
+            self.load_random_neo()
+
+    def load_random_neo(self) -> None:
+        """Make a size-weighted catalog NEO the next launch, with its own diameter."""
+        ast = self._draw_neo(LOAD_NEO_WEIGHT)
+        if ast is not None:
+            self.next_asteroid = ast
+            diameter_m = neo_diameter_m(ast)
+            self.next_launch_params = {"diameter_m": diameter_m} if diameter_m else None
+        elif sample_neo:
             neo = sample_neo()
-            self.scenario["diameter_m"] = neo["diameter_m"]
-            self.scenario["density"] = neo["density_kgm3"]
-            self.scenario["angle_deg"] = neo["angle_deg"]
-            # If you want to reflect neo speed in-game, convert m/s -> px/tick:
-            # v_px_per_tick = (neo["speed_mps"] * SECONDS_PER_TICK) / M_PER_PX
+            self.next_asteroid = preset_asteroid(neo)
+            self.next_launch_params = {"diameter_m": neo["diameter_m"], "density": neo["density_kgm3"]}
 
     # -------------------------------------------------------------------------
     # Simulation
@@ -266,6 +348,9 @@ class Game:
     def update_physics(self) -> None:
         bodies = self.primaries + self.asteroids
         physics.update_bodies(bodies, dt=1)
+        self.tick += 1
+        if self.recorder:
+            self.recorder.record(self.tick, bodies)
 
     def handle_collisions_and_culling(self) -> None:
         # Asteroid vs Earth / Moon, Off-screen culling
@@ -274,18 +359,23 @@ class Game:
             if self._circle_overlap(asteroid, self.earth):
                 self._compute_impact_effects(asteroid)
                 self.asteroids.remove(asteroid)
+                self.asteroid_pool.release(asteroid)
                 continue
 
             # Moon collision
             if self._circle_overlap(asteroid, self.moon):
                 self.asteroids.remove(asteroid)
+                self.asteroid_pool.release(asteroid)
                 continue
 
         # Off-screen culling
-        self.asteroids = [
-            a for a in self.asteroids
-            if 0 <= a.x <= WIDTH and 0 <= a.y <= HEIGHT
-        ]
+        kept = []
+        for a in self.asteroids:
+            if 0 <= a.x <= WIDTH and 0 <= a.y <= HEIGHT:
+                kept.append(a)
+            else:
+                self.asteroid_pool.release(a)
+        self.asteroids = kept
 
     @staticmethod
     def _circle_overlap(a: CelestialBody, b: CelestialBody) -> bool:
@@ -298,27 +388,41 @@ class Game:
         v_mps = (v_px_per_tick * M_PER_PX) / SECONDS_PER_TICK
 
         self.last_effects = effects(
-            diameter_m=getattr(asteroid, "diameter_m", DEFAULT_DIAMETER_M),
-            density=getattr(asteroid, "density", DEFAULT_DENSITY),
+            diameter_m=asteroid.diameter_m,
+            density=asteroid.density,
             v_mps=v_mps,
             angle_deg=self.scenario["angle_deg"],
         )
         self.effects_expire_ms = pygame.time.get_ticks() + EFFECTS_DURATION_MS
 
+        if self.damage:
+            offset = (asteroid.x - self.earth.x, asteroid.y - self.earth.y)
+            self.damage.add_impact(offset, self.last_effects)
+
     # -------------------------------------------------------------------------
     # Actions
     # -------------------------------------------------------------------------
     def launch_next_asteroid(self) -> None:
         """Launches the preselected 'next_asteroid', then picks a new one."""
+        if self.next_asteroid is None:
+            print("No asteroid to launch (catalog is empty).")
+            return
+
+        # physical params for consequence + deflection math (N-key overrides apply once)
+        params = dict(self.scenario, **(self.next_launch_params or {}))
+        self.next_launch_params = None
         asteroid = make_asteroid(
             (self.launcher_x, self.launcher_y),
             self.launch_angle,
-            self.next_asteroid
+            self.next_asteroid,
+            diameter_m=params["diameter_m"],
+            density=params["density"],
+            pool=self.asteroid_pool,
         )
-        # attach physical params for consequence + deflection math
-        asteroid.diameter_m = self.scenario["diameter_m"]
-        asteroid.density = self.scenario["density"]
         self.asteroids.append(asteroid)
+        if self.recorder:
+            self.recorder.register_body(asteroid.body_id, self.next_asteroid.get('name'),
+                                        "asteroid", self.tick)
 
         print(json.dumps(self.next_asteroid, indent=4))
         print(f"Launched {asteroid.nasa_data['name']}...")
@@ -328,7 +432,24 @@ class Game:
         self.effects_expire_ms = 0
 
         # choose a new upcoming asteroid
-        self.next_asteroid = random.choice(self.nasa_asteroids)
+        self.next_asteroid = self.pick_next_asteroid()
+
+    def pick_next_asteroid(self) -> dict | None:
+        """
+        Weighted draw of the next NEO to launch from the indexed catalog.
+        Falls back to the sample_neo preset if the catalog is empty, else None.
+        """
+        ast = self._draw_neo(NEXT_ASTEROID_WEIGHT)
+        if ast is None and sample_neo:
+            ast = preset_asteroid(sample_neo())
+        return ast
+
+    def _draw_neo(self, weight: str) -> dict | None:
+        """One NeoWs record, `weight`-ed via the catalog (uniform without numpy), or None."""
+        if self.catalog is not None:
+            idx = self.catalog.query().sample(weight=weight, rng=random)
+            return None if idx is None else self.catalog.record(idx)
+        return random.choice(self.nasa_asteroids) if self.nasa_asteroids else None
 
     def deflect_last_asteroid(self) -> None:
         """Apply a kinetic-impactor-style Δv to the most-recent asteroid."""
@@ -338,9 +459,7 @@ class Game:
         target = self.asteroids[-1]
         print(f"Deflecting {target.nasa_data['name']}...")
 
-        d = getattr(target, "diameter_m", DEFAULT_DIAMETER_M)
-        rho = getattr(target, "density", DEFAULT_DENSITY)
-        m_ast = mass_from_diam(d, rho)
+        m_ast = mass_from_diam(target.diameter_m, target.density)
 
         dv_mps = delta_v_kinetic(
             m_impactor=DEFAULT_IMPACTOR_MASS,
@@ -360,74 +479,93 @@ class Game:
     # -------------------------------------------------------------------------
     def draw(self) -> None:
         self.screen.fill((0, 0, 0))
+        alpha = self.scheduler.alpha
+        self.renderer.trail_step = self.scheduler.trail_step
+
+        # Cumulative damage heatmap (under everything else)
+        if self.damage:
+            self.damage.draw(self.screen, (self.earth.x, self.earth.y))
 
         # Primaries
-        for body in self.primaries:
-            body.draw(self.screen)
+        self.renderer.draw(self.screen, self.primaries, alpha)
 
         # Asteroids
-        for asteroid in self.asteroids:
-            asteroid.draw(self.screen)
-
-        # HUD: left side
-        self._draw_hud_left()
-
-        # HUD: right side (info for the last asteroid)
-        self._draw_hud_right()
+        self.renderer.draw(self.screen, self.asteroids, alpha)
 
         # Effects overlay near Earth (if active)
         now = pygame.time.get_ticks()
         if self.last_effects and now < self.effects_expire_ms:
             draw_effects(self.screen, (self.earth.x, self.earth.y), self.last_effects)
-            # textual side info
-            y = 84
-            for line in info_lines(self.last_effects):
-                render_text(self.screen, line, (HUD_MARGIN, y), self.font, HUD_ALT_COLOR)
-                y += HUD_LINE_HEIGHT
         else:
             self.last_effects = None  # expire
 
+        # HUD (left, right, effects text); reuse the last layout when degraded
+        if not self.scheduler.skip_hud:
+            self._layout_hud()
+        self.screen.blits(self._hud_items, doreturn=False)
+
         # Launcher (base + barrel)
         self._draw_launcher()
 
         pygame.display.flip()
 
-    def _draw_hud_left(self) -> None:
+    def _hud_text(self, text: str, color: tuple[int, int, int] = HUD_COLOR) -> pygame.Surface:
+        """Rendered HUD line; most lines are unchanged from frame to frame, so they are cached."""
+        key = (text, color)
+        surf = self._hud_text_cache.get(key)
+        if surf is None:
+            if len(self._hud_text_cache) >= HUD_TEXT_CACHE_SIZE:
+                self._hud_text_cache.clear()
+            surf = self._hud_text_cache[key] = self.font.render(text, True, color)
+        return surf
+
+    def _layout_hud(self) -> None:
+        items = []
+
+        # HUD: left side
+        self._layout_hud_left(items)
+
+        # HUD: right side (info for the last asteroid)
+        self._layout_hud_right(items)
+
+        # textual side info for the active effects
+        if self.last_effects:
+            y = 84
+            for line in info_lines(self.last_effects):
+                items.append((self._hud_text(line, HUD_ALT_COLOR), (HUD_MARGIN, y)))
+                y += HUD_LINE_HEIGHT
+
+        self._hud_items = items
+
+    def _layout_hud_left(self, items: list) -> None:
         y = HUD_MARGIN
-        next_name = self.next_asteroid.get('name', 'Unknown')
-        render_text(self.screen, f"Next Asteroid: {next_name}", (HUD_MARGIN, y), self.font)
+        next_name = self.next_asteroid.get('name', 'Unknown') if self.next_asteroid else "None"
+        items.append((self._hud_text(f"Next Asteroid: {next_name}"), (HUD_MARGIN, y)))
         y += HUD_LINE_HEIGHT * 2
 
         angle_deg = math.degrees(self.launch_angle)
-        render_text(self.screen, f"Angle: {angle_deg:.0f}°", (HUD_MARGIN, y), self.font)
+        items.append((self._hud_text(f"Angle: {angle_deg:.0f}°"), (HUD_MARGIN, y)))
 
-    def _draw_hud_right(self) -> None:
+    def _layout_hud_right(self, items: list) -> None:
         if not self.asteroids:
             return
 
         last = self.asteroids[-1]
-        ca_list = last.nasa_data.get('close_approach_data', [])
-        if ca_list:
-            try:
-                kmh = float(ca_list[0]['relative_velocity']['kilometers_per_hour'])
-            except (KeyError, ValueError, TypeError):
-                kmh = 0.0
-        else:
-            kmh = 0.0
+        kmh = relative_speed_kmh(last.nasa_data, default=0.0)
 
         # Right-aligned block at ~x = WIDTH - margin
         name_text = f"Asteroid name: {last.nasa_data.get('name', 'Unknown')}"
         speed_text = f"Speed (km/h): {kmh:.2f}"
 
-        name_surf = self.font.render(name_text, True, HUD_COLOR)
-        speed_surf = self.font.render(speed_text, True, HUD_COLOR)
+        name_surf = self._hud_text(name_text)
+        speed_surf = self._hud_text(speed_text)
 
         x_name = WIDTH - name_surf.get_width() - HUD_MARGIN
         x_speed = WIDTH - speed_surf.get_width() - HUD_MARGIN
         y_base = 100
 
-        self.screen.blit(name_surf, (x_name, y_base))
-        self.screen.blit(speed_surf, (x_speed, y_base + name_surf.get_height() + 5))
+        items.append((name_surf, (x_name, y_base)))
+        items.append((speed_surf, (x_speed, y_base + name_surf.get_height() + 5)))
 
     def _draw_launcher(self) -> None:
         # base
@@ -448,17 +586,28 @@ class Game:
     # Main loop (async for pygbag)
     # -------------------------------------------------------------------------
     async def run(self) -> None:
-        while self.running:
-            self.clock.tick(FPS)
-            self.handle_events()
-            self.update_physics()
-            self.handle_collisions_and_culling()
-            self.draw()
-
-            # CRITICAL for browser (yield to JS/WASM loop)
-            await asyncio.sleep(0)
-
-        pygame.quit()
+        try:
+            while self.running:
+                self.clock.tick(FPS)
+                ticks = self.scheduler.begin_frame()
+                self.handle_events()
+                for _ in range(ticks):
+                    self.update_physics()
+                    self.handle_collisions_and_culling()
+                if self.scheduler.render_this_frame:
+                    self.draw()
+                self.scheduler.end_frame()
+
+                # CRITICAL for browser (yield to JS/WASM loop)
+                await asyncio.sleep(0)
+
+            print(f"Scheduler: {json.dumps(self.scheduler.report())}")
+        finally:
+            # flush the partial chunk + index even if the loop raised
+            if self.recorder:
+                self.recorder.close()
+                print(f"Recorded {self.recorder.rows} body states to {self.recorder.directory}")
+            pygame.quit()
 
 
 # =============================================================================
@@ -466,7 +615,7 @@ class Game:
 # =============================================================================
 
 async def main():
-    game = Game()
+    game = Game(record_dir=os.environ.get(RECORD_DIR_ENV))
     await game.run()
 
 if __name__ == "__main__":
@@ -41,7 +41,9 @@ def update_bodies(bodies, dt):
         # Update velocity
         body.vx += ax * dt
         body.vy += ay * dt
-        # Update position
+        # Update position (keep the previous one for render interpolation)
+        body.prev_x = body.x
+        body.prev_y = body.y
         body.x += body.vx * dt
         body.y += body.vy * dt
         # Record the new position for the orbit trail
@@ -0,0 +1,250 @@
+# recording.py
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+
+CHUNK_ROWS = 65_536          # rows per chunk file
+MAX_PENDING_CHUNKS = 2       # full chunks allowed to wait for the writer thread
+INDEX_FILE = "index.json"
+
+# Per-tick body state, one .npy file per column per chunk
+COLUMNS = (
+    ("id", np.int64),
+    ("tick", np.int64),
+    ("x", np.float64),
+    ("y", np.float64),
+    ("vx", np.float64),
+    ("vy", np.float64),
+)
+
+
+def _chunk_path(directory: str, chunk: int, column: str) -> str:
+    return os.path.join(directory, f"chunk_{chunk:06d}.{column}.npy")
+
+
+class TrajectoryRecorder:
+    """
+    Streams per-tick body state (id, tick, x, y, vx, vy) to chunked columnar
+    .npy files on a background writer thread.
+
+    Rows go into a preallocated chunk buffer; full buffers are handed to the
+    writer and recycled once written. Only MAX_PENDING_CHUNKS + 1 buffers ever
+    exist, so memory stays bounded: if the disk falls behind, record() blocks
+    until a buffer frees up rather than growing.
+
+    index.json (rewritten after every chunk and on close) lists each chunk's
+    row count and tick/id range so TrajectoryReader can skip chunks without
+    opening them, plus the body table filled in by register_body().
+
+    A writer failure (disk full, permissions, ...) is reported once and the
+    recorder disables itself; the game keeps running.
+    """
+
+    def __init__(self, directory: str, chunk_rows: int = CHUNK_ROWS,
+                 max_pending: int = MAX_PENDING_CHUNKS):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.rows = 0                 # rows saved on disk and listed in index.json
+        self.error = None
+        self.enabled = True
+
+        self._free = queue.Queue()
+        for _ in range(max_pending + 1):
+            self._free.put({name: np.empty(chunk_rows, dtype) for name, dtype in COLUMNS})
+        self._pending = queue.Queue()
+        self._buf = self._free.get()
+        self._n = 0
+        self._next_chunk = 0
+        self._chunks = []
+        self._bodies = {}             # body_id -> {"name", "role", "tick"}
+        self._lock = threading.Lock()   # guards _bodies (game thread vs writer)
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._writer, name="trajectory-writer", daemon=True)
+        self._thread.start()
+
+    def register_body(self, body_id: int, name: str, role: str, tick: int = 0) -> None:
+        """Record who a body_id is (e.g. "Earth"/"earth", a NEO name/"asteroid")."""
+        with self._lock:
+            self._bodies[int(body_id)] = {"name": name, "role": role, "tick": int(tick)}
+
+    def record(self, tick: int, bodies) -> None:
+        """Append one row per body for this tick (no-op once disabled)."""
+        if not self.enabled:
+            return
+        if self.error:
+            self._disable()
+            return
+        n = len(bodies)
+        start = 0
+        while start < n:
+            take = min(n - start, self.chunk_rows - self._n)
+            part = bodies[start:start + take]
+            lo, hi = self._n, self._n + take
+            buf = self._buf
+            buf["id"][lo:hi] = [b.body_id for b in part]
+            buf["tick"][lo:hi] = tick
+            buf["x"][lo:hi] = [b.x for b in part]
+            buf["y"][lo:hi] = [b.y for b in part]
+            buf["vx"][lo:hi] = [b.vx for b in part]
+            buf["vy"][lo:hi] = [b.vy for b in part]
+            self._n = hi
+            start += take
+            if self._n == self.chunk_rows:
+                self.flush()
+
+    def flush(self) -> None:
+        """Hand the current (partial) chunk to the writer."""
+        if self._n:
+            self._pending.put((self._next_chunk, self._buf, self._n))
+            self._next_chunk += 1
+            self._buf = self._free.get()     # blocks while all buffers are in flight
+            self._n = 0
+
+    def close(self) -> None:
+        """Flush, wait for the writer to finish, and finalize the index."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.enabled:
+            self.flush()
+        self._pending.put(None)
+        self._thread.join()
+        if not self.error:
+            try:
+                self._write_index()
+            except OSError as exc:
+                self.error = exc
+        if self.error:
+            self._disable()
+
+    def _disable(self) -> None:
+        if self.enabled:
+            self.enabled = False
+            print(f"Trajectory recording stopped: {type(self.error).__name__}: {self.error}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------------------------------
+    def _writer(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            chunk, buf, n = item
+            try:
+                for name, _ in COLUMNS:
+                    np.save(_chunk_path(self.directory, chunk, name), buf[name][:n])
+                self._chunks.append({
+                    "chunk": chunk,
+                    "rows": n,
+                    "tick_min": int(buf["tick"][0]),
+                    "tick_max": int(buf["tick"][n - 1]),
+                    "id_min": int(buf["id"][:n].min()),
+                    "id_max": int(buf["id"][:n].max()),
+                })
+                try:
+                    self._write_index()
+                except Exception:
+                    self._chunks.pop()    # not readable without its index entry
+                    raise
+                self.rows += n
+            except Exception as exc:  # reported (once) from the game thread
+                self.error = exc
+            finally:
+                self._free.put(buf)
+
+    def _write_index(self) -> None:
+        with self._lock:
+            bodies = {str(k): v for k, v in self._bodies.items()}
+        index = {
+            "columns": [name for name, _ in COLUMNS],
+            "chunk_rows": self.chunk_rows,
+            "chunks": self._chunks,
+            "bodies": bodies,
+        }
+        path = os.path.join(self.directory, INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+
+
+class TrajectoryReader:
+    """
+    Random access over a TrajectoryRecorder directory.
+
+    Column files are memory-mapped; rows within a chunk are in tick order, so
+    a tick range is located with searchsorted and only that slice is read.
+    Chunks outside the requested tick/id range are never opened.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            index = json.load(f)
+        self.chunks = index["chunks"]
+        self.rows = sum(c["rows"] for c in self.chunks)
+        # body_id -> {"name", "role", "tick"} as registered by the game
+        self.bodies = {int(k): v for k, v in index.get("bodies", {}).items()}
+
+    def find_bodies(self, name: str | None = None, role: str | None = None) -> list:
+        """body_ids whose registered role matches and name contains `name` (case-insensitive)."""
+        return [
+            body_id for body_id, info in sorted(self.bodies.items())
+            if (role is None or info["role"] == role)
+            and (name is None or name.lower() in (info["name"] or "").lower())
+        ]
+
+    @property
+    def tick_range(self):
+        if not self.chunks:
+            return None
+        return self.chunks[0]["tick_min"], self.chunks[-1]["tick_max"]
+
+    def _column(self, chunk: int, name: str) -> np.ndarray:
+        return np.load(_chunk_path(self.directory, chunk, name), mmap_mode="r")
+
+    def query(self, tick_min: int | None = None, tick_max: int | None = None,
+              body_id: int | None = None) -> dict:
+        """Return {column: array} for rows with tick_min <= tick <= tick_max (and body_id, if given)."""
+        parts = {name: [] for name, _ in COLUMNS}
+        for c in self.chunks:
+            if tick_min is not None and c["tick_max"] < tick_min:
+                continue
+            if tick_max is not None and c["tick_min"] > tick_max:
+                continue
+            if body_id is not None and not c["id_min"] <= body_id <= c["id_max"]:
+                continue
+
+            ticks = self._column(c["chunk"], "tick")
+            lo = 0 if tick_min is None else int(np.searchsorted(ticks, tick_min, side="left"))
+            hi = len(ticks) if tick_max is None else int(np.searchsorted(ticks, tick_max, side="right"))
+            if lo >= hi:
+                continue
+            sel = slice(lo, hi)
+            if body_id is not None:
+                sel = lo + np.flatnonzero(self._column(c["chunk"], "id")[lo:hi] == body_id)
+                if not len(sel):
+                    continue
+            for name, _ in COLUMNS:
+                parts[name].append(np.asarray(self._column(c["chunk"], name)[sel]))
+
+        return {
+            name: np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype)
+            for name, dtype in COLUMNS
+        }
+
+    def trajectory(self, body_id: int, tick_min: int | None = None, tick_max: int | None = None) -> dict:
+        """Convenience: one body's state history over a tick range."""
+        return self.query(tick_min, tick_max, body_id)
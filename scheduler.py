@@ -0,0 +1,111 @@
+# scheduler.py
+import time
+
+SIM_HZ = 60                  # fixed simulation rate (one physics tick = dt 1)
+MAX_TICKS_PER_FRAME = 5      # cap on catch-up ticks before simulated time is dropped
+RECOVER_FRAMES = 30          # calm frames needed before stepping back down a level
+HUD_REDRAW_EVERY = 4         # while degraded, re-render the HUD once every N frames
+REDUCED_TRAIL_STEP = 4       # while degraded, draw every Nth trail point
+
+# Degradation ladder, cheapest visual loss first. Simulation ticks are only
+# dropped ("drop_ticks") when catch-up exceeds MAX_TICKS_PER_FRAME.
+LEVELS = ("skip_hud", "reduce_trails", "drop_render")
+
+
+class FrameScheduler:
+    """
+    Fixed-timestep scheduler that decouples simulation rate from render rate.
+
+    Each frame, real elapsed time is added to an accumulator which is drained
+    in whole simulation ticks; `alpha` is the leftover fraction of a tick, used
+    to interpolate body positions between the last two physics states.
+
+    Frame work time (begin_frame -> end_frame) is compared to a budget. Over
+    budget raises the degradation level by one; RECOVER_FRAMES calm frames
+    lower it again. `counts` records how often each degradation fired.
+    """
+
+    def __init__(self, sim_hz: float = SIM_HZ, budget_ms: float = 1000.0 / SIM_HZ,
+                 max_ticks_per_frame: int = MAX_TICKS_PER_FRAME, clock=time.perf_counter):
+        self.tick_s = 1.0 / sim_hz
+        self.budget_s = budget_ms / 1000.0
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.clock = clock
+
+        self.accumulator = 0.0
+        self.level = 0
+        self.frames = 0
+        self.ticks = 0
+        self.counts = {name: 0 for name in LEVELS + ("drop_ticks",)}
+
+        # Per-frame decisions (read by the game while drawing)
+        self.skip_hud = False
+        self.trail_step = 1
+        self.render_this_frame = True
+
+        self._last = None
+        self._frame_start = 0.0
+        self._calm = 0
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a tick between the previous and current physics state."""
+        return min(1.0, self.accumulator / self.tick_s)
+
+    def begin_frame(self) -> int:
+        """Start a frame; return how many simulation ticks to run now."""
+        now = self.clock()
+        if self._last is None:
+            self._last = now - self.tick_s   # first frame runs one tick
+        self.accumulator += now - self._last
+        self._last = now
+        self._frame_start = now
+        self.frames += 1
+
+        ticks = int(self.accumulator / self.tick_s)
+        self.accumulator -= ticks * self.tick_s
+        if ticks > self.max_ticks_per_frame:
+            # Too far behind to catch up: let simulated time slip
+            self.counts["drop_ticks"] += ticks - self.max_ticks_per_frame
+            ticks = self.max_ticks_per_frame
+        self.ticks += ticks
+
+        self._plan_degradations()
+        return ticks
+
+    def end_frame(self) -> None:
+        """Finish a frame and adjust the degradation level from its work time."""
+        work = self.clock() - self._frame_start
+        if work > self.budget_s:
+            self.level = min(self.level + 1, len(LEVELS))
+            self._calm = 0
+        elif work < 0.5 * self.budget_s:
+            self._calm += 1
+            if self._calm >= RECOVER_FRAMES and self.level > 0:
+                self.level -= 1
+                self._calm = 0
+        else:
+            self._calm = 0
+
+    def report(self) -> dict:
+        """Frame/tick totals plus how often each degradation fired."""
+        frames = max(1, self.frames)
+        return {
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "level": self.level,
+            "counts": dict(self.counts),
+            "rates": {name: n / frames for name, n in self.counts.items() if name != "drop_ticks"},
+        }
+
+    def _plan_degradations(self) -> None:
+        self.skip_hud = self.level >= 1 and self.frames % HUD_REDRAW_EVERY != 0
+        self.trail_step = REDUCED_TRAIL_STEP if self.level >= 2 else 1
+        self.render_this_frame = not (self.level >= 3 and self.frames % 2)
+
+        if self.skip_hud:
+            self.counts["skip_hud"] += 1
+        if self.trail_step > 1:
+            self.counts["reduce_trails"] += 1
+        if not self.render_this_frame:
+            self.counts["drop_render"] += 1
@@ -0,0 +1,320 @@
+# service/jobs.py
+"""
+Simulation jobs for the HTTP service (service/server.py).
+
+Everything here runs inside ProcessPoolExecutor workers, so inputs and
+outputs are plain JSON-able dicts/lists. Numeric inputs must be finite
+(NaN/inf are rejected with ValueError). The world (Earth, Moon, launcher,
+px/tick scaling) comes from world.py, shared with main.Game; nothing here
+imports pygame.
+"""
+import math
+
+import physics
+import world
+from entities import CelestialBody
+from orbits import spawn_circular_orbit
+from config import (
+    M_PER_PX,
+    SECONDS_PER_TICK,
+    DEFAULT_DIAMETER_M,
+    DEFAULT_DENSITY,
+    DEFAULT_IMPACTOR_MASS,
+    DEFAULT_IMPACTOR_SPEED,
+    DEFAULT_BETA,
+)
+from data.nasa_data import get_asteroid, relative_speed_kmh
+from data.catalog import NeoCatalog
+from models.impact_effects import effects, mass_from_diam
+from models.deflection import delta_v_kinetic
+
+MAX_TICKS = 20_000            # hard cap on a single propagation
+DEFAULT_TICKS = 2_000
+CATALOG_LIMIT = 50
+SORTS = {"fastest": ("speed_kmh", True), "closest": ("miss_km", False)}   # sort -> (field, largest)
+
+# exceptions a job raises on bad input (answered with 400)
+INPUT_ERRORS = (ArithmeticError, KeyError, TypeError, ValueError)
+
+_catalog = None               # loaded once per worker process
+_index = None
+
+
+def _finite(params: dict, name: str, default=None) -> float:
+    """params[name] (or default) as a finite float; ValueError otherwise."""
+    value = params.get(name, default)
+    if value is None:
+        raise KeyError(name)
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite number")
+    return value
+
+
+# =============================================================================
+# Catalog
+# =============================================================================
+
+def load_catalog() -> list:
+    global _catalog
+    if _catalog is None:
+        _catalog = get_asteroid(live=False)
+    return _catalog
+
+
+def load_index() -> NeoCatalog:
+    global _index
+    if _index is None:
+        _index = NeoCatalog.from_records(load_catalog())
+    return _index
+
+
+def find_neo(neo_id=None, name=None):
+    """Return the first NeoWs record matching id (exact) or name (case-insensitive substring)."""
+    for ast in load_catalog():
+        if neo_id is not None and ast.get('id') == str(neo_id):
+            return ast
+        if name is not None and name.lower() in ast.get('name', '').lower():
+            return ast
+    return None
+
+
+def summarize_neo(ast: dict) -> dict:
+    ca = (ast.get('close_approach_data') or [{}])[0]
+    try:
+        miss_km = float(ca['miss_distance']['kilometers'])
+    except (KeyError, TypeError, ValueError):
+        miss_km = None
+    return {
+        "id": ast.get('id'),
+        "name": ast.get('name'),
+        "diameter_m_max": ast['estimated_diameter']['meters']['estimated_diameter_max'],
+        "hazardous": ast.get('is_potentially_hazardous_asteroid', False),
+        "speed_kmh": relative_speed_kmh(ast),
+        "miss_km": miss_km,
+        "approach_date": ca.get('close_approach_date'),
+    }
+
+
+def catalog(params: dict) -> dict:
+    """
+    Catalog lookup by `id`, or a filtered listing (up to `limit` matches):
+      name                      case-insensitive substring
+      hazardous                 true / false
+      diameter_min/diameter_max meters
+      sort                      "fastest" | "closest"
+    """
+    limit = int(params.get("limit", CATALOG_LIMIT))
+    if "id" in params:
+        ast = find_neo(neo_id=params["id"])
+        return {"results": [summarize_neo(ast)] if ast else []}
+
+    index = load_index()
+    q = index.query()
+    if "hazardous" in params:
+        q = q.hazardous(str(params["hazardous"]).lower() in ("1", "true", "yes"))
+    if "diameter_min" in params or "diameter_max" in params:
+        lo, hi = params.get("diameter_min"), params.get("diameter_max")
+        q = q.diameter_between(None if lo is None else float(lo), None if hi is None else float(hi))
+
+    sort = params.get("sort")
+    if sort is not None and sort not in SORTS:
+        raise ValueError(f"unknown sort {sort!r}")
+    name = str(params.get("name", "")).lower()
+
+    if name:
+        # substring match needs the records: walk every filtered row
+        if sort is None:
+            rows = q.indices()
+        else:
+            field, largest = SORTS[sort]
+            rows = q.top(field, index.size, largest)
+        matches = [a for a in (index.record(i) for i in rows) if name in a.get('name', '').lower()]
+        return {"count": len(matches), "results": [summarize_neo(a) for a in matches[:limit]]}
+
+    # no name filter: count from the index, build records for the first `limit` rows only
+    if sort is None:
+        count = q.count()
+        rows = q.indices()[:limit]
+    else:
+        field, largest = SORTS[sort]
+        count = q.where(field).count()     # rows with a value to sort by
+        rows = q.top(field, limit, largest)
+    return {"count": count, "results": [summarize_neo(index.record(i)) for i in rows]}
+
+
+# =============================================================================
+# Trajectory propagation
+# =============================================================================
+
+def initial_state(params: dict) -> dict:
+    """
+    Build the serializable propagation state from request params:
+      id | name | speed_kmh   asteroid (NeoWs lookup) or explicit speed
+      x, y, angle_deg         launch point (px) and launcher angle
+      ticks, stride           max ticks to run, sample every Nth tick
+      diameter_m, density,
+      entry_angle_deg         physical params for the impact model
+    """
+    speed_kmh = params.get("speed_kmh")
+    neo = None
+    if speed_kmh is None:
+        neo = find_neo(params.get("id"), params.get("name"))
+        if neo is None:
+            raise ValueError("unknown asteroid: pass a catalog `id`/`name` or `speed_kmh`")
+        speed_kmh = relative_speed_kmh(neo, default=20000.0)
+    speed_kmh = _finite({"speed_kmh": speed_kmh}, "speed_kmh")
+
+    ticks = int(params.get("ticks", DEFAULT_TICKS))
+    if not 0 < ticks <= MAX_TICKS:
+        raise ValueError(f"ticks must be in 1..{MAX_TICKS}")
+
+    angle = math.radians(_finite(params, "angle_deg", 90.0))
+    speed_ppf = speed_kmh * world.KMH_TO_PPF
+
+    earth = CelestialBody(world.EARTH_POS[0], world.EARTH_POS[1], 0, 0,
+                          world.EARTH_MASS, world.EARTH_RADIUS, world.EARTH_COLOR)
+    moon = spawn_circular_orbit(earth, world.MOON_DISTANCE_PX, world.MOON_MASS,
+                                world.MOON_RADIUS_PX, world.MOON_COLOR, G=world.PHYS_G)
+    asteroid = [
+        _finite(params, "x", world.LAUNCHER_INIT_X),
+        _finite(params, "y", world.LAUNCHER_INIT_Y),
+        speed_ppf * math.cos(angle),
+        -speed_ppf * math.sin(angle),
+        2, 5,
+    ]
+    return {
+        "tick": 0,
+        "max_ticks": ticks,
+        "stride": max(1, int(params.get("stride", 1))),
+        "name": neo.get('name') if neo else None,
+        "diameter_m": _finite(params, "diameter_m", DEFAULT_DIAMETER_M),
+        "density": _finite(params, "density", DEFAULT_DENSITY),
+        "entry_angle_deg": _finite(params, "entry_angle_deg", 90.0),
+        "bodies": [
+            [b.x, b.y, b.vx, b.vy, b.mass, b.radius] for b in (earth, moon)
+        ] + [asteroid],
+    }
+
+
+def _overlap(a: CelestialBody, b: CelestialBody) -> bool:
+    dx, dy = a.x - b.x, a.y - b.y
+    return (dx * dx + dy * dy) ** 0.5 < (a.radius + b.radius)
+
+
+def propagate_chunk(state: dict, n_ticks: int) -> tuple:
+    """
+    Advance `state` by up to n_ticks. Returns (points, state, outcome) where
+    points are [tick, x, y, vx, vy] samples of the asteroid and outcome is
+    None while still flying, else "earth" | "moon" | "offscreen" | "timeout".
+    """
+    earth, moon, asteroid = [
+        CelestialBody(x, y, vx, vy, mass, radius, None) for x, y, vx, vy, mass, radius in state["bodies"]
+    ]
+    bodies = [earth, moon, asteroid]
+    tick, stride = state["tick"], state["stride"]
+    end = min(state["max_ticks"], tick + n_ticks)
+    points = []
+    outcome = None
+
+    while tick < end:
+        physics.update_bodies(bodies, dt=1)
+        tick += 1
+        if tick % stride == 0:
+            points.append([tick, asteroid.x, asteroid.y, asteroid.vx, asteroid.vy])
+        if _overlap(asteroid, earth):
+            outcome = "earth"
+        elif _overlap(asteroid, moon):
+            outcome = "moon"
+        elif not (0 <= asteroid.x <= world.WIDTH and 0 <= asteroid.y <= world.HEIGHT):
+            outcome = "offscreen"
+        if outcome:
+            break
+    if outcome is None and tick >= state["max_ticks"]:
+        outcome = "timeout"
+    if outcome and (not points or points[-1][0] != tick):
+        points.append([tick, asteroid.x, asteroid.y, asteroid.vx, asteroid.vy])
+
+    state = dict(state, tick=tick, bodies=[[b.x, b.y, b.vx, b.vy, b.mass, b.radius] for b in bodies])
+    return points, state, outcome
+
+
+def outcome_summary(state: dict, outcome: str) -> dict:
+    """Final record for a propagation; includes impact effects on an Earth hit."""
+    result = {"outcome": outcome, "ticks": state["tick"], "name": state["name"]}
+    if outcome == "earth":
+        _, _, vx, vy, _, _ = state["bodies"][2]
+        v_mps = (math.hypot(vx, vy) * M_PER_PX) / SECONDS_PER_TICK
+        result["impact"] = effects(
+            diameter_m=state["diameter_m"],
+            density=state["density"],
+            v_mps=v_mps,
+            angle_deg=state["entry_angle_deg"],
+        )
+    return result
+
+
+def propagate(params: dict) -> dict:
+    state = initial_state(params)
+    points, state, outcome = propagate_chunk(state, state["max_ticks"])
+    result = outcome_summary(state, outcome)
+    result["points"] = points
+    return result
+
+
+# =============================================================================
+# Impact / deflection
+# =============================================================================
+
+def impact(params: dict) -> dict:
+    """models.impact_effects.effects for diameter_m, density, v_mps, angle_deg."""
+    return effects(
+        diameter_m=_finite(params, "diameter_m", DEFAULT_DIAMETER_M),
+        density=_finite(params, "density", DEFAULT_DENSITY),
+        v_mps=_finite(params, "v_mps"),
+        angle_deg=_finite(params, "angle_deg", 90.0),
+    )
+
+
+def deflect(params: dict) -> dict:
+    """Kinetic-impactor Δv for an asteroid of diameter_m/density (DART-style defaults)."""
+    m_ast = mass_from_diam(_finite(params, "diameter_m", DEFAULT_DIAMETER_M),
+                           _finite(params, "density", DEFAULT_DENSITY))
+    dv_mps = delta_v_kinetic(
+        m_impactor=_finite(params, "m_impactor", DEFAULT_IMPACTOR_MASS),
+        v_impactor_mps=_finite(params, "v_impactor_mps", DEFAULT_IMPACTOR_SPEED),
+        m_asteroid=m_ast,
+        beta=_finite(params, "beta", DEFAULT_BETA),
+    )
+    return {
+        "mass_kg": m_ast,
+        "delta_v_mps": dv_mps,
+        "delta_v_px_per_tick": dv_mps / (M_PER_PX / SECONDS_PER_TICK),
+    }
+
+
+# =============================================================================
+# Batch entry point
+# =============================================================================
+
+JOBS = {
+    "propagate": propagate,
+    "impact": impact,
+    "deflect": deflect,
+    "catalog": catalog,
+}
+
+
+def run_batch(batch: list) -> list:
+    """
+    Run [(kind, params), ...] in one worker call. Every job's exception is
+    returned as that job's {"error": ...}, so one bad request never fails
+    the rest of its batch.
+    """
+    results = []
+    for kind, params in batch:
+        try:
+            results.append({"ok": JOBS[kind](params)})
+        except Exception as exc:
+            results.append({"error": f"{type(exc).__name__}: {exc}"})
+    return results
@@ -0,0 +1,115 @@
+# service/loadtest.py
+"""
+Load test for service/server.py: requests/second and latency percentiles.
+
+Start the service first, then from the repo root:
+    python -m service.loadtest --concurrency 32 --requests 2000
+    python -m service.loadtest --mix impact --unique 1.0     # defeat the cache
+
+Each client keeps one keep-alive connection open and sends requests back to
+back. --unique is the fraction of requests with fresh (uncached) params.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+MIXES = {
+    "all": ("propagate", "impact", "deflect", "catalog"),
+    "propagate": ("propagate",),
+    "impact": ("impact",),
+    "deflect": ("deflect",),
+    "catalog": ("catalog",),
+}
+
+
+def make_request(kind: str, rng: random.Random, unique: bool) -> tuple[str, str, dict | None]:
+    jitter = rng.random() if unique else 0.0
+    if kind == "propagate":
+        return "POST", "/propagate", {"speed_kmh": 30000 + 1000 * jitter, "x": 400, "y": 580,
+                                      "angle_deg": rng.choice([30, 60, 90, 120]), "ticks": 1000,
+                                      "stride": 10}
+    if kind == "impact":
+        return "POST", "/impact", {"diameter_m": 150 + jitter, "density": 3000, "v_mps": 17000}
+    if kind == "deflect":
+        return "POST", "/deflect", {"diameter_m": 150 + jitter, "density": 3000}
+    name = rng.choice(["2025", "QY6", "SP29"]) if not unique else str(rng.randint(0, 9))
+    return "GET", f"/catalog?name={name}&limit=5", None
+
+
+async def send(reader, writer, host: str, method: str, path: str, payload) -> int:
+    body = json.dumps(payload).encode() if payload is not None else b""
+    head = (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host: str, port: int, n: int, kinds, unique: float, seed: int,
+                 latencies: list, failures: list) -> None:
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n):
+            method, path, payload = make_request(rng.choice(kinds), rng, rng.random() < unique)
+            t0 = time.perf_counter()
+            status = await send(reader, writer, host, method, path, payload)
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def run(args) -> None:
+    latencies, failures = [], []
+    per_client = max(1, args.requests // args.concurrency)
+    t0 = time.perf_counter()
+    await asyncio.gather(*[
+        client(args.host, args.port, per_client, MIXES[args.mix], args.unique, seed,
+               latencies, failures)
+        for seed in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - t0
+
+    lat_ms = sorted(x * 1000.0 for x in latencies)
+    print(f"requests:    {len(lat_ms)} ({len(failures)} non-200) in {elapsed:.2f} s")
+    print(f"throughput:  {len(lat_ms) / elapsed:.1f} req/s")
+    print("latency ms:  " + "  ".join(
+        f"p{p}={percentile(lat_ms, p):.2f}" for p in (50, 90, 99)
+    ) + f"  max={lat_ms[-1] if lat_ms else 0.0:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--mix", choices=sorted(MIXES), default="all")
+    parser.add_argument("--unique", type=float, default=0.5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
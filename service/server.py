@@ -0,0 +1,358 @@
+# service/server.py
+"""
+Local HTTP/JSON simulation service (no pygame window needed).
+
+Run from the repo root (the offline catalog is read from data/my_data.json):
+    python -m service.server --port 8765 --workers 4
+
+Endpoints (JSON in, JSON out):
+    POST /propagate   {"name": "QY6", "x": 400, "y": 580, "angle_deg": 60, "ticks": 2000}
+                      add "stream": true for chunked NDJSON (one line per chunk,
+                      final line carries the outcome / impact effects)
+    POST /impact      {"diameter_m": 150, "density": 3000, "v_mps": 17000, "angle_deg": 45}
+    POST /deflect     {"diameter_m": 150, "density": 3000, "beta": 3.0}
+    GET  /catalog?name=2025&hazardous=true&diameter_min=100&sort=fastest&limit=10
+    GET  /catalog?id=2247517
+    GET  /stats       batching / cache counters
+
+Small jobs are queued and dispatched to a process pool in batches; identical
+queries (same kind + params) are served from an LRU cache, and concurrent
+identical queries share one in-flight computation. The cache is bounded by
+entry count and by total trajectory points; very long propagations are not
+cached (use "stream": true for those).
+
+Bad input is answered with 400; worker/pool failures with 500.
+"""
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from service import jobs
+
+BATCH_WINDOW_S = 0.002        # how long to wait for more jobs once one arrives
+BATCH_MAX = 64                # max jobs per dispatch round
+CACHE_SIZE = 4096             # cached query results
+CACHE_MAX_POINTS = 200_000    # trajectory points held across all cached results
+CACHE_ENTRY_MAX_POINTS = 5_000  # larger /propagate results are never cached
+STREAM_CHUNK_TICKS = 500      # ticks per streamed trajectory chunk
+MAX_BODY_BYTES = 1 << 20
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class BatchDispatcher:
+    """
+    Collects submitted jobs for BATCH_WINDOW_S, then splits the batch across
+    the pool workers (one jobs.run_batch call each) and resolves each job's
+    future with its result. Results are cached by (kind, canonical params).
+
+    Results are {"ok": ...} or {"error": ...} (bad params, from run_batch), or
+    {"fault": ...} when the pool itself failed; neither failure is cached.
+    """
+
+    def __init__(self, pool: ProcessPoolExecutor, workers: int, cache_size: int = CACHE_SIZE):
+        self.pool = pool
+        self.workers = workers
+        self.cache_size = cache_size
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._cache: OrderedDict = OrderedDict()   # key -> asyncio.Future
+        self._weights = {}                         # key -> cached trajectory points
+        self._cached_points = 0
+        self._task = None
+        self._dispatches = set()                   # in-flight _dispatch tasks (asyncio keeps weak refs)
+        self.stats = {"jobs": 0, "batches": 0, "cache_hits": 0, "errors": 0, "faults": 0}
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+        for task in self._dispatches:
+            task.cancel()
+
+    async def submit(self, kind: str, params: dict):
+        key = (kind, json.dumps(params, sort_keys=True))
+        fut = self._cache.get(key)
+        if fut is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            self._cache[key] = fut
+            self._evict()
+            await self._queue.put((kind, params, key, fut))
+
+        result = await asyncio.shield(fut)
+        if "fault" in result:
+            raise HttpError(500, result["fault"])
+        if "error" in result:
+            raise HttpError(400, result["error"])
+        return result["ok"]
+
+    def _forget(self, key) -> None:
+        del self._cache[key]
+        self._cached_points -= self._weights.pop(key, 0)
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until both cache bounds hold."""
+        while self._cache and (len(self._cache) > self.cache_size
+                               or self._cached_points > CACHE_MAX_POINTS):
+            self._forget(next(iter(self._cache)))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + BATCH_WINDOW_S
+            while len(batch) < BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.stats["jobs"] += len(batch)
+            self.stats["batches"] += 1
+            n = min(self.workers, len(batch))
+            for i in range(n):
+                task = asyncio.create_task(self._dispatch(batch[i::n]))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, part: list) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self.pool, jobs.run_batch, [(kind, params) for kind, params, _, _ in part]
+            )
+        except Exception as exc:  # worker crashed / pool broken
+            results = [{"fault": f"{type(exc).__name__}: {exc}"}] * len(part)
+        for (_, _, key, fut), result in zip(part, results):
+            cached = self._cache.get(key) is fut
+            if "ok" not in result:
+                # don't cache failures
+                self.stats["faults" if "fault" in result else "errors"] += 1
+                if cached:
+                    self._forget(key)
+            elif cached:
+                points = len(result["ok"].get("points", ()))
+                if points > CACHE_ENTRY_MAX_POINTS:
+                    self._forget(key)
+                elif points:
+                    self._weights[key] = points
+                    self._cached_points += points
+                    self._evict()
+            if not fut.done():
+                fut.set_result(result)
+
+
+class SimulationServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: int | None = None):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.dispatcher = BatchDispatcher(self.pool, self.workers)
+        self.server = None
+
+    async def start(self) -> None:
+        self.dispatcher.start()
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        print(f"Simulation service on http://{self.host}:{self.port} ({self.workers} workers)")
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        await self.dispatcher.stop()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        self.pool.shutdown(cancel_futures=True)
+
+    # -------------------------------------------------------------------------
+    # HTTP plumbing (HTTP/1.1, keep-alive, Content-Length bodies only)
+    # -------------------------------------------------------------------------
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, query, body, keep_alive = request
+                try:
+                    await self._route(writer, method, path, query, body)
+                except HttpError as exc:
+                    self._write_json(writer, exc.status, {"error": str(exc)})
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as exc:
+                    self._write_json(writer, 500, {"error": f"{type(exc).__name__}: {exc}"})
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HttpError as exc:
+            self._write_json(writer, exc.status, {"error": str(exc)})
+        except Exception as exc:
+            self._write_json(writer, 500, {"error": f"{type(exc).__name__}: {exc}"})
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "malformed request line")
+
+        headers = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = h.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise HttpError(400, "Content-Length must be an integer")
+        if length < 0:
+            raise HttpError(400, "Content-Length must not be negative")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        conn = headers.get("connection", "").lower()
+        keep_alive = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+        url = urlsplit(target)
+        return method.upper(), url.path, dict(parse_qsl(url.query)), body, keep_alive
+
+    @staticmethod
+    def _write_head(writer: asyncio.StreamWriter, status: int, headers: dict) -> None:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    def _write_json(self, writer: asyncio.StreamWriter, status: int, payload) -> None:
+        try:
+            data = json.dumps(payload, allow_nan=False).encode()
+        except ValueError:   # NaN/inf in a result: not representable in JSON
+            raise HttpError(400, "result is not finite (check the input magnitudes)")
+        self._write_head(writer, status, {"Content-Type": "application/json",
+                                          "Content-Length": len(data)})
+        writer.write(data)
+
+    # -------------------------------------------------------------------------
+    # Routes
+    # -------------------------------------------------------------------------
+    async def _route(self, writer, method: str, path: str, query: dict, body: bytes) -> None:
+        if path == "/stats":
+            self._write_json(writer, 200, self.dispatcher.stats)
+            return
+        if path == "/catalog":
+            if method != "GET":
+                raise HttpError(405, "use GET")
+            params = dict(query)
+            if "limit" in params:
+                params["limit"] = _int_param(params["limit"], "limit", minimum=1)
+            self._write_json(writer, 200, await self.dispatcher.submit("catalog", params))
+            return
+        if path.lstrip("/") not in ("propagate", "impact", "deflect"):
+            raise HttpError(404, f"no route {path}")
+        if method != "POST":
+            raise HttpError(405, "use POST")
+
+        try:
+            params = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "body must be JSON")
+        if not isinstance(params, dict):
+            raise HttpError(400, "body must be a JSON object")
+
+        kind = path.lstrip("/")
+        stream = params.pop("stream", False)   # not part of the query (or its cache key)
+        if kind == "propagate" and stream:
+            await self._stream_propagation(writer, params)
+            return
+        self._write_json(writer, 200, await self.dispatcher.submit(kind, params))
+
+    async def _stream_propagation(self, writer: asyncio.StreamWriter, params: dict) -> None:
+        """Chunked NDJSON: each chunk of STREAM_CHUNK_TICKS is computed on the pool and sent as it lands."""
+        loop = asyncio.get_running_loop()
+        try:
+            state = await loop.run_in_executor(self.pool, jobs.initial_state, params)
+        except jobs.INPUT_ERRORS as exc:
+            raise HttpError(400, f"{type(exc).__name__}: {exc}")
+
+        self._write_head(writer, 200, {"Content-Type": "application/x-ndjson",
+                                       "Transfer-Encoding": "chunked"})
+        outcome = None
+        try:
+            while outcome is None:
+                points, state, outcome = await loop.run_in_executor(
+                    self.pool, jobs.propagate_chunk, state, STREAM_CHUNK_TICKS
+                )
+                if points:
+                    _write_chunk(writer, {"points": points})
+                    await writer.drain()
+            _write_chunk(writer, jobs.outcome_summary(state, outcome))
+        except Exception as exc:
+            # headers are already out: a status can't be sent, so cut the stream short
+            raise ConnectionAbortedError(f"stream aborted: {exc}") from exc
+        writer.write(b"0\r\n\r\n")
+
+
+def _write_chunk(writer: asyncio.StreamWriter, payload) -> None:
+    data = json.dumps(payload, allow_nan=False).encode() + b"\n"
+    writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+def _int_param(value: str, name: str, minimum: int | None = None) -> int:
+    try:
+        value = int(value)
+    except ValueError:
+        raise HttpError(400, f"{name} must be an integer")
+    if minimum is not None and value < minimum:
+        raise HttpError(400, f"{name} must be at least {minimum}")
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Asteroid simulation HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    server = SimulationServer(args.host, args.port, args.workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.pool.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# ui/heatmap.py
+import numpy as np
+import pygame
+from typing import Dict, Tuple
+from config import KM_PER_PX
+
+GRID_HALF_PX = 160          # layer covers Earth center ± this many px
+LAYER_ALPHA = 150           # overall opacity of the heat texture
+
+
+def _heat_lut() -> np.ndarray:
+    """256-entry black -> red -> yellow -> white ramp (index 0 stays black = transparent)."""
+    t = np.linspace(0.0, 1.0, 256)
+    lut = np.empty((256, 3), dtype=np.uint8)
+    lut[:, 0] = np.clip(t * 3.0, 0, 1) * 255
+    lut[:, 1] = np.clip(t * 3.0 - 1.0, 0, 1) * 255
+    lut[:, 2] = np.clip(t * 3.0 - 2.0, 0, 1) * 255
+    lut[1:] = np.maximum(lut[1:], 1)   # keep any exposure off the colorkey
+    return lut
+
+
+class DamageLayer:
+    """
+    Persistent overpressure-exposure grid around Earth.
+
+    Each impact adds its blast_rings (psi, radius_km) as a radial step
+    function: a cell gets the psi of the smallest ring that contains it.
+    Only the bounding box of the outermost ring is touched per impact, and
+    the texture is rebuilt from the grid (via surfarray) only when it changed.
+
+    The grid is Earth-centered and indexed [x, y] like surfarray; one cell
+    is `cell_px` screen pixels (cell_px * KM_PER_PX km).
+    """
+
+    def __init__(self, half_px: int = GRID_HALF_PX, cell_px: int = 1, alpha: int = LAYER_ALPHA):
+        self.cell_px = cell_px
+        self.cell_km = cell_px * KM_PER_PX
+        self.half_cells = half_px // cell_px
+        size = 2 * self.half_cells + 1
+        self.grid = np.zeros((size, size), dtype=np.float32)   # accumulated psi
+        self.impacts = 0
+        self._lut = _heat_lut()
+        self._surface = pygame.Surface((size, size))
+        self._surface.set_colorkey((0, 0, 0))
+        self._surface.set_alpha(alpha)
+        self._scaled = self._surface
+        self._dirty = False
+
+    def add_impact(self, offset_px: Tuple[float, float], eff: Dict) -> None:
+        """
+        Accumulate one impact. `offset_px` is the impact point relative to
+        Earth's center; `eff` is the dict from models.impact_effects.effects(...).
+        """
+        rings = sorted(eff["blast_rings"], key=lambda ring: ring[1])
+        radii = np.array([r_km / self.cell_km for _, r_km in rings])
+        if not len(radii) or radii[-1] <= 0:
+            return
+        psi = np.array([p for p, _ in rings] + [0.0], dtype=np.float32)
+
+        cx = self.half_cells + offset_px[0] / self.cell_px
+        cy = self.half_cells + offset_px[1] / self.cell_px
+        reach = radii[-1]
+        n = self.grid.shape[0]
+        x0, x1 = max(0, int(cx - reach)), min(n, int(cx + reach) + 2)
+        y0, y1 = max(0, int(cy - reach)), min(n, int(cy + reach) + 2)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        xs = np.arange(x0, x1, dtype=np.float32)[:, None] - cx
+        ys = np.arange(y0, y1, dtype=np.float32)[None, :] - cy
+        r = np.sqrt(xs * xs + ys * ys)
+        # index of the smallest ring with radius >= r; past the last ring -> 0 psi
+        self.grid[x0:x1, y0:y1] += psi[np.searchsorted(radii, r, side="left")]
+        self.impacts += 1
+        self._dirty = True
+
+    def clear(self) -> None:
+        self.grid.fill(0.0)
+        self.impacts = 0
+        self._dirty = True
+
+    def draw(self, screen: pygame.Surface, center_px: Tuple[float, float]) -> None:
+        """Blit the heat texture centered on Earth (no-op until the first impact)."""
+        if not self.impacts:
+            return
+        if self._dirty:
+            self._rebuild_texture()
+        half = self.half_cells * self.cell_px
+        screen.blit(self._scaled, (int(center_px[0]) - half, int(center_px[1]) - half))
+
+    def export(self, path: str) -> str:
+        """Save the accumulated grid (+ scale metadata) to an .npz file; returns the path."""
+        np.savez(
+            path,
+            exposure_psi=self.grid,
+            cell_km=self.cell_km,
+            half_cells=self.half_cells,
+            impacts=self.impacts,
+        )
+        return path if path.endswith(".npz") else path + ".npz"
+
+    def _rebuild_texture(self) -> None:
+        peak = float(self.grid.max())
+        if peak > 0:
+            idx = (np.log1p(self.grid) * (255.0 / np.log1p(peak))).astype(np.uint8)
+        else:
+            idx = np.zeros(self.grid.shape, dtype=np.uint8)
+        pygame.surfarray.blit_array(self._surface, self._lut[idx])
+        if self.cell_px > 1:
+            size = self._surface.get_width() * self.cell_px
+            self._scaled = pygame.transform.scale(self._surface, (size, size))
+        self._dirty = False
@@ -0,0 +1,143 @@
+# ui/renderer.py
+import pygame
+from typing import Dict, Sequence, Tuple
+
+try:
+    import numpy as np
+except Exception:
+    # numpy is optional for browser builds; the sprite path works without it
+    np = None
+
+COLORKEY = (255, 0, 255)        # never used as a body color
+SPLAT_THRESHOLD = 5000          # body count above which the point-splat path kicks in
+SPLAT_SIZE = 2                  # splat footprint in px (square)
+TRAIL_MAX_POINTS = 300          # newest trail points drawn per body (~one Moon orbit)
+
+
+class BodyRenderer:
+    """
+    Batched renderer for lists of CelestialBody.
+
+    Bodies are drawn from an atlas of pre-rendered circle sprites keyed by
+    (radius, color) and submitted to the screen with a single Surface.blits
+    call instead of one pygame.draw.circle per body.
+
+    `alpha` interpolates each body between its previous and current physics
+    position (prev + (cur - prev) * alpha); alpha=1 draws the current state.
+
+    Trails are still one pygame.draw.lines call per body (batching them through
+    numpy was slower, since trails are Python lists); only the newest
+    trail_max points of each trail are drawn so the cost per body is bounded.
+
+    For very dense fields (>= splat_threshold bodies) positions are written
+    straight into the screen's pixel array via surfarray as small squares;
+    trails are skipped in that mode.
+    """
+
+    def __init__(self, splat_threshold: int = SPLAT_THRESHOLD, splat_size: int = SPLAT_SIZE,
+                 trail_step: int = 1, trail_max: int = TRAIL_MAX_POINTS):
+        self.splat_threshold = splat_threshold
+        self.splat_size = splat_size
+        self.trail_step = trail_step          # draw every Nth trail point
+        self.trail_max = trail_max            # newest points drawn per trail
+        self._atlas: Dict[Tuple[int, Tuple[int, int, int]], pygame.Surface] = {}
+        self._mapped: Dict[Tuple[int, int, int], int] = {}
+
+    # -------------------------------------------------------------------------
+    # Sprite atlas
+    # -------------------------------------------------------------------------
+    def sprite(self, radius, color) -> pygame.Surface:
+        """Return the cached sprite for (radius, color), rendering it on first use."""
+        key = (radius, color)
+        surf = self._atlas.get(key)
+        if surf is None:
+            r = int(radius)
+            surf = pygame.Surface((2 * r + 1, 2 * r + 1))
+            surf.fill(COLORKEY)
+            pygame.draw.circle(surf, color, (r, r), r)
+            surf.set_colorkey(COLORKEY, pygame.RLEACCEL)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            self._atlas[key] = surf
+        return surf
+
+    # -------------------------------------------------------------------------
+    # Drawing
+    # -------------------------------------------------------------------------
+    def draw(self, screen: pygame.Surface, bodies: Sequence, alpha: float = 1.0) -> None:
+        """Draw trails and bodies, picking the sprite or splat path by body count."""
+        if not bodies:
+            return
+        if len(bodies) >= self.splat_threshold and self._can_splat(screen):
+            self.draw_splats(screen, bodies, alpha)
+            return
+        self.draw_trails(screen, bodies)
+        self.draw_sprites(screen, bodies, alpha)
+
+    def draw_trails(self, screen: pygame.Surface, bodies: Sequence) -> None:
+        step = max(1, int(self.trail_step))
+        limit = self.trail_max
+        for body in bodies:
+            orbit = body.orbit
+            if len(orbit) < 2:
+                continue
+            if limit and len(orbit) > limit:
+                orbit = orbit[-limit:]
+            pts = orbit[::step] if step > 1 else orbit
+            if len(pts) < 2:
+                continue
+            pygame.draw.lines(screen, body.color, False, pts, 1)
+
+    def draw_sprites(self, screen: pygame.Surface, bodies: Sequence, alpha: float = 1.0) -> None:
+        atlas = self._atlas
+        batch = []
+        append = batch.append
+        for b in bodies:
+            r = b.radius
+            surf = atlas.get((r, b.color)) or self.sprite(r, b.color)
+            if alpha >= 1.0:
+                append((surf, (b.x - r, b.y - r)))
+            else:
+                px, py = b.prev_x, b.prev_y
+                append((surf, (px + (b.x - px) * alpha - r, py + (b.y - py) * alpha - r)))
+        screen.blits(batch, doreturn=False)
+
+    def draw_splats(self, screen: pygame.Surface, bodies: Sequence, alpha: float = 1.0) -> None:
+        """Write each body as a splat_size x splat_size square into the pixel array."""
+        n = len(bodies)
+        w, h = screen.get_size()
+        xs = np.fromiter((b.x for b in bodies), dtype=np.float64, count=n)
+        ys = np.fromiter((b.y for b in bodies), dtype=np.float64, count=n)
+        if alpha < 1.0:
+            pxs = np.fromiter((b.prev_x for b in bodies), dtype=np.float64, count=n)
+            pys = np.fromiter((b.prev_y for b in bodies), dtype=np.float64, count=n)
+            xs = pxs + (xs - pxs) * alpha
+            ys = pys + (ys - pys) * alpha
+        xs = xs.astype(np.intp)
+        ys = ys.astype(np.intp)
+        mapped = self._mapped_color
+        cols = np.fromiter((mapped(screen, b.color) for b in bodies), dtype=np.int64, count=n)
+
+        pixels = pygame.surfarray.pixels2d(screen)
+        try:
+            cols = cols.astype(pixels.dtype)
+            for ox in range(self.splat_size):
+                for oy in range(self.splat_size):
+                    px = xs + ox
+                    py = ys + oy
+                    keep = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+                    pixels[px[keep], py[keep]] = cols[keep]
+        finally:
+            del pixels  # release the surface lock
+
+    def _mapped_color(self, screen: pygame.Surface, color) -> int:
+        value = self._mapped.get(color)
+        if value is None:
+            value = screen.map_rgb(color)
+            self._mapped[color] = value
+        return value
+
+    @staticmethod
+    def _can_splat(screen: pygame.Surface) -> bool:
+        # surfarray.pixels2d does not support 24-bit surfaces
+        return np is not None and screen.get_bytesize() in (1, 2, 4)
@@ -0,0 +1,24 @@
+# world.py
+# Shared world layout / scaling used by the game (main.py) and the headless
+# simulation service (service/jobs.py). Keep this module free of pygame.
+
+# Playfield (px); bodies leaving it are culled
+WIDTH, HEIGHT = 800, 600
+
+# Launcher start position
+LAUNCHER_INIT_X, LAUNCHER_INIT_Y = 400, 580
+
+# Primary bodies
+EARTH_POS = (400, 300)
+EARTH_MASS = 10000
+EARTH_RADIUS = 20
+EARTH_COLOR = (0, 100, 255)
+
+MOON_DISTANCE_PX = 120
+MOON_MASS = 100
+MOON_RADIUS_PX = 8
+MOON_COLOR = (180, 180, 255)
+PHYS_G = 0.1                     # must match physics.G in your engine
+
+# Asteroid gameplay scaling
+KMH_TO_PPF = 0.00003             # real km/h -> pixels per simulation tick (tunable)